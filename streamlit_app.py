@@ -1,24 +1,116 @@
+import html
 import re
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import pandas as pd
 import streamlit as st
-import feedparser
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree
 
 # Azure Updates RSS Feed
 RSS_URL = 'https://www.microsoft.com/releasecommunications/api/v2/azure/rss'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+# HTML-to-text patterns for clean_html
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Status keywords, matched in one pass; one named group per status
+STATUS_RE = re.compile(
+    r'\b(?:(?P<ga>generally available|GA)'
+    r'|(?P<public_preview>public preview)'
+    r'|(?P<private_preview>private preview)'
+    r'|(?P<launched>launched?)'
+    r'|(?P<available>available)'
+    r'|(?P<retired>retired?|retirement))\b',
+    re.IGNORECASE,
+)
+# Status for each STATUS_RE group, in priority order
+STATUS_GROUPS = {
+    'ga': 'Generally Available',
+    'public_preview': 'Public Preview',
+    'private_preview': 'Private Preview',
+    'launched': 'Launched',
+    'available': 'Available',
+    'retired': 'Retired',
+}
+
+# Status badge shown next to each update
+STATUS_COLORS = {
+    'Generally Available': '🟢',
+    'Launched': '🟢',
+    'Available': '🟢',
+    'Public Preview': '🔵',
+    'Private Preview': '🟡',
+    'Retired': '🔴',
+}
 
 st.set_page_config(page_title="Azure Updates — Launched", page_icon="🚀", layout="wide")
 st.title("🚀 Azure Updates — Launched (Newest → Oldest)")
 st.caption("Source: Azure Release Communications RSS Feed - Filtered to [Launched] only")
 
 # ----------------------------- Helpers ----------------------------------------
+@st.cache_resource(show_spinner=False)
+def get_session() -> requests.Session:
+    """Shared HTTP session so pooled connections survive Streamlit reruns."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; AzureUpdatesViewer/1.0)"})
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_feed_validators() -> dict:
+    """Last ETag/Last-Modified per feed URL, with the entries parsed from that response."""
+    return {}
+
+def parse_rss_items(stream) -> list:
+    """Parse RSS <item> elements from a file-like object into plain dicts."""
+    entries = []
+    for _, item in etree.iterparse(stream, events=("end",), tag="item", resolve_entities=False):
+        entries.append({
+            'title': (item.findtext('title') or '').strip(),
+            'link': (item.findtext('link') or '').strip(),
+            'published': (item.findtext('pubDate') or '').strip(),
+            'summary': item.findtext('description') or '',
+            'content': item.findtext(CONTENT_ENCODED) or '',
+            'tags': [c.text.strip() for c in item.iterfind('category') if c.text],
+        })
+        # Drop the finished item (and earlier siblings) so memory stays flat
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+    return entries
+
 @st.cache_data(ttl=60 * 30, show_spinner=False)  # cache for 30 minutes
 def fetch_rss_feed(url: str):
-    """Fetch and parse the Azure RSS feed."""
+    """Fetch the Azure RSS feed and return its items as plain dicts."""
     try:
-        feed = feedparser.parse(url)
-        return feed
+        # Ask the server to skip the body if the feed hasn't changed
+        validators = get_feed_validators()
+        previous = validators.get(url)
+        headers = {}
+        if previous and previous['etag']:
+            headers['If-None-Match'] = previous['etag']
+        if previous and previous['last_modified']:
+            headers['If-Modified-Since'] = previous['last_modified']
+        
+        with get_session().get(url, headers=headers, timeout=20, stream=True) as resp:
+            if resp.status_code == 304 and previous:
+                return previous['entries']
+            resp.raise_for_status()
+            # Parse the (decompressed) body straight off the socket, one <item> at a time
+            resp.raw.decode_content = True
+            entries = parse_rss_items(resp.raw)
+        
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if etag or last_modified:
+            validators[url] = {'etag': etag, 'last_modified': last_modified, 'entries': entries}
+        return entries
     except Exception as e:
         st.error(f"Error fetching RSS feed: {e}")
         return None
@@ -27,111 +119,132 @@ def clean_html(html_content: str) -> str:
     """Remove HTML tags and clean up text."""
     if not html_content:
         return ""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    # Remove script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-    text = soup.get_text()
+    # Remove script and style elements, then the remaining tags
+    text = SCRIPT_STYLE_RE.sub(' ', html_content)
+    text = html.unescape(TAG_RE.sub(' ', text))
     # Clean up whitespace
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = ' '.join(chunk for chunk in chunks if chunk)
-    return text
+    return WHITESPACE_RE.sub(' ', text).strip()
 
 def parse_feed_entry(entry):
     """Parse a single RSS feed entry into structured data."""
     # Title
-    title = entry.get('title', 'Untitled')
+    title = entry['title'] or 'Untitled'
     
     # Link
-    link = entry.get('link', '')
+    link = entry['link']
     
-    # Published date
+    # Published date (RFC 822 in RSS, ISO 8601 as a fallback)
     date_dt = None
-    if 'published_parsed' in entry and entry.published_parsed:
+    if entry['published']:
         try:
-            date_dt = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-        except:
-            pass
+            date_dt = parsedate_to_datetime(entry['published'])
+        except (TypeError, ValueError):
+            try:
+                date_dt = datetime.fromisoformat(entry['published'].replace('Z', '+00:00'))
+            except ValueError:
+                pass
     
-    if not date_dt and 'published' in entry:
-        try:
-            date_dt = datetime.fromisoformat(entry.published.replace('Z', '+00:00'))
-        except:
-            pass
+    if date_dt and not date_dt.tzinfo:
+        date_dt = date_dt.replace(tzinfo=timezone.utc)
+    elif date_dt:
+        date_dt = date_dt.astimezone(timezone.utc)
     
     if not date_dt:
         date_dt = datetime.now(timezone.utc)
     
     # Summary/Description
-    summary_html = entry.get('summary', '')
-    summary_text = clean_html(summary_html)
+    summary_html = entry['summary']
     
     # Content (might be more complete than summary)
-    content_html = ''
-    if 'content' in entry and entry.content:
-        content_html = entry.content[0].value if isinstance(entry.content, list) else entry.content
+    content_html = entry['content']
     
     description = content_html if content_html else summary_html
     description_text = clean_html(description)
     
     # Tags/Categories
-    tags = []
-    if 'tags' in entry:
-        tags = [tag.term for tag in entry.tags if hasattr(tag, 'term')]
+    tags = entry['tags']
     
     # Try to extract status from title or content
-    status = "Update"
-    status_patterns = [
-        (r'\b(generally available|GA)\b', 'Generally Available'),
-        (r'\b(public preview)\b', 'Public Preview'),
-        (r'\b(private preview)\b', 'Private Preview'),
-        (r'\b(launched?)\b', 'Launched'),
-        (r'\b(available)\b', 'Available'),
-        (r'\b(retired?|retirement)\b', 'Retired'),
-    ]
-    
-    search_text = f"{title} {description_text}".lower()
-    for pattern, status_name in status_patterns:
-        if re.search(pattern, search_text, re.IGNORECASE):
-            status = status_name
-            break
+    search_text = f"{title} {description_text}"
+    found = {m.lastgroup for m in STATUS_RE.finditer(search_text)}
+    status = next((name for group, name in STATUS_GROUPS.items() if group in found), "Update")
     
-    return {
+    update = {
         'title': title,
+        'title_safe': html.escape(title),  # Escaped once for rendering
         'link': link,
         'date': date_dt,
         'status': status,
         'tags': tags,
-        'description_html': description,
         'description_text': description_text[:500],  # First 500 chars
+        # Lowercased once so the search filter doesn't fold case on every keystroke
+        'search_lc': f"{title} {description_text[:500]}".lower(),
     }
+    update['card_md'] = render_card(update)
+    return update
+
+def render_card(update: dict) -> str:
+    """Format the body of one update card (everything below the numbered heading) as markdown."""
+    parts = []
+    if update['link']:
+        parts.append(f"[🔗 View]({update['link']})")
+    
+    # Metadata row
+    meta = [f"📅 **Date:** {update['date'].strftime('%b %d, %Y')}"]
+    icon = STATUS_COLORS.get(update['status'], '⚪')
+    meta.append(f"{icon} **Status:** {update['status']}")
+    if update['tags']:
+        tags_str = ", ".join(update['tags'][:3])
+        if len(update['tags']) > 3:
+            tags_str += f" +{len(update['tags']) - 3} more"
+        meta.append(f"🏷️ **Tags:** {html.escape(tags_str)}")
+    parts.append("<small>" + " &nbsp;|&nbsp; ".join(meta) + "</small>")
+    
+    # Description
+    if update['description_text']:
+        details = html.escape(update['description_text'])
+        if len(update['description_text']) >= 499:
+            details += "\n\n<small><i>Click the link above for full details</i></small>"
+        parts.append(f"<details><summary>📄 View Description</summary>\n\n{details}\n\n</details>")
+    
+    parts.append("---")
+    return "\n\n".join(parts)
+
+@st.cache_data(ttl=60 * 30, show_spinner=False)  # cache for 30 minutes
+def load_updates(url: str):
+    """Return parsed [Launched] updates as a DataFrame (newest first), or None if the feed is unavailable."""
+    entries = fetch_rss_feed(url)
+    if not entries:
+        return None
+    
+    # Parse only items with [Launched] in title; the title check is cheap, so
+    # skip the HTML cleaning and status detection for everything else
+    updates = [
+        parse_feed_entry(entry) for entry in entries
+        if '[Launched]' in entry['title']
+    ]
+    
+    # Sort by date (newest first)
+    updates.sort(key=lambda x: x['date'], reverse=True)
+    return pd.DataFrame(updates)
 
 # ----------------------------- Fetch & Parse ----------------------------------
 with st.spinner("Fetching Azure Updates from RSS feed…"):
-    feed = fetch_rss_feed(RSS_URL)
+    updates = load_updates(RSS_URL)
     
-    if not feed or not feed.entries:
+    if updates is None:
         st.error("Failed to fetch RSS feed or no entries found.")
         st.info("The RSS feed might be temporarily unavailable. Try again later.")
         st.stop()
 
-# Parse all entries
-updates = [parse_feed_entry(entry) for entry in feed.entries]
-
-# Filter for only items with [Launched] in title
-updates = [u for u in updates if '[Launched]' in u['title']]
-
-# Sort by date (newest first)
-updates.sort(key=lambda x: x['date'], reverse=True)
-
 # ----------------------------- Filters ----------------------------------------
 st.sidebar.header("🔍 Filters")
 
 # Date range filter
-if updates:
-    min_date = min(u['date'] for u in updates).date()
-    max_date = max(u['date'] for u in updates).date()
+if not updates.empty:
+    # Rows are sorted newest first by the cached loader, so the bounds are the ends
+    min_date = updates['date'].iloc[-1].date()
+    max_date = updates['date'].iloc[0].date()
     
     date_range = st.sidebar.date_input(
         "Date Range",
@@ -147,23 +260,24 @@ if updates:
         start_date = end_date = date_range if not isinstance(date_range, tuple) else date_range[0]
 
 # Search filter
-search_query = st.sidebar.text_input("🔎 Search in title/description")
+search_query = st.sidebar.text_input(
+    "🔎 Search in title/description",
+    help="Separate words with spaces; every word must match.",
+)
 
-# Apply filters
+# Apply filters as one combined boolean mask over the frame
 filtered_updates = updates
 
-if updates:
-    filtered_updates = [
-        u for u in filtered_updates 
-        if start_date <= u['date'].date() <= end_date
-    ]
-
-if search_query:
-    query_lower = search_query.lower()
-    filtered_updates = [
-        u for u in filtered_updates 
-        if query_lower in u['title'].lower() or query_lower in u['description_text'].lower()
-    ]
+if not updates.empty:
+    start_ts = pd.Timestamp(start_date, tz='UTC')
+    end_ts = pd.Timestamp(end_date, tz='UTC') + pd.Timedelta(days=1)
+    mask = (updates['date'] >= start_ts) & (updates['date'] < end_ts)
+    
+    # Every search term must appear in the title or description
+    for term in search_query.lower().split():
+        mask &= updates['search_lc'].str.contains(term, regex=False)
+    
+    filtered_updates = updates[mask]
 
 # ----------------------------- Header -----------------------------------------
 cols = st.columns([1, 1, 1, 1])
@@ -181,51 +295,18 @@ with cols[3]:
 st.divider()
 
 # ----------------------------- Render -----------------------------------------
-if not filtered_updates:
+if filtered_updates.empty:
     st.info("No updates match your current filters. Try adjusting the filters in the sidebar.")
 else:
-    for idx, update in enumerate(filtered_updates):
-        with st.container():
-            # Header row
-            col1, col2 = st.columns([5, 1])
-            with col1:
-                st.subheader(f"{idx + 1}. {update['title']}")
-            with col2:
-                if update['link']:
-                    st.markdown(f"[🔗 View]({update['link']})")
-            
-            # Metadata row
-            meta_cols = st.columns([2, 2, 3])
-            with meta_cols[0]:
-                date_str = update['date'].strftime('%b %d, %Y')
-                st.caption(f"📅 **Date:** {date_str}")
-            with meta_cols[1]:
-                status_colors = {
-                    'Generally Available': '🟢',
-                    'Launched': '🟢',
-                    'Available': '🟢',
-                    'Public Preview': '🔵',
-                    'Private Preview': '🟡',
-                    'Retired': '🔴',
-                }
-                icon = status_colors.get(update['status'], '⚪')
-                st.caption(f"{icon} **Status:** {update['status']}")
-            with meta_cols[2]:
-                if update['tags']:
-                    tags_str = ", ".join(update['tags'][:3])
-                    if len(update['tags']) > 3:
-                        tags_str += f" +{len(update['tags']) - 3} more"
-                    st.caption(f"🏷️ **Tags:** {tags_str}")
-            
-            # Description
-            if update['description_text']:
-                with st.expander("📄 View Description", expanded=False):
-                    # Show cleaned text version
-                    st.write(update['description_text'])
-                    if len(update['description_text']) >= 499:
-                        st.caption("_Click the link above for full details_")
-            
-            st.divider()
+    # One markdown block for the whole list; card bodies are prebuilt in the
+    # cached loader, so only the numbering depends on the current filters
+    st.markdown(
+        "\n\n".join(
+            f"### {idx + 1}. {title}\n\n{card}"
+            for idx, (title, card) in enumerate(zip(filtered_updates['title_safe'], filtered_updates['card_md']))
+        ),
+        unsafe_allow_html=True,
+    )
 
 # ----------------------------- Footer -----------------------------------------
 st.sidebar.divider()